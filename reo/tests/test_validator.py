@@ -30,7 +30,9 @@
 import json
 import os
 import copy
+from unittest.mock import patch
 from django.test import TestCase
+from reo import validators
 from reo.validators import ValidateNestedInput
 
 
@@ -162,3 +164,175 @@ class InputValidatorTests(TestCase):
                     test_str in validator.warnings['Following inputs were resampled:']['ElectricTariff']
                     for test_str in ["{} {}".format(up_or_down, rate) for rate in rates]
                 ))
+
+    def test_list_of_float_min_max(self):
+        """
+        confirm that a list with any value outside of the allowable min or max is flagged, and a list within bounds is
+        not. No list_of_float input has a max in nested_input_definitions, so the max is checked with a test template.
+        :return: None
+        """
+        rates = ["wholesale_rate_us_dollars_per_kwh", "wholesale_rate_above_site_load_us_dollars_per_kwh"]
+        post = copy.deepcopy(self.post)
+        for rate in rates:
+            post['Scenario']['Site']['ElectricTariff'][rate] = [0.1] * 8759 + [-0.1]
+        validator = self.get_validator(post)
+        self.assertEquals(validator.isValid, False)
+        for rate in rates:
+            assert(any('At least one value in {} (from Scenario>Site>ElectricTariff) exceeds allowable min of 0.0'
+                       .format(rate) in e for e in validator.errors['input_errors']))
+
+        post = copy.deepcopy(self.post)
+        for rate in rates:
+            post['Scenario']['Site']['ElectricTariff'][rate] = [0.1] * 8760
+        validator = self.get_validator(post)
+        self.assertEquals(validator.isValid, True)
+
+        template = {'series': {'type': 'list_of_float', 'min': 0.0, 'max': 1.0}}
+        validator = self.get_validator(copy.deepcopy(self.post))
+        validator.check_min_max_restrictions(['Scenario', 'Site', 'Test'], template_values=template,
+                                             real_values={'series': [0.0, 0.5, 1.0]})
+        self.assertEquals(validator.isValid, True)
+        validator.check_min_max_restrictions(['Scenario', 'Site', 'Test'], template_values=template,
+                                             real_values={'series': [0.0, 0.5, 1.5]})
+        self.assertEquals(validator.isValid, False)
+        assert(any('At least one value in series (from Scenario>Site>Test) exceeds the allowable max of 1.0' in e
+                   for e in validator.errors['input_errors']))
+
+    def test_invalid_time_steps_per_hour(self):
+        """
+        confirm that a time_steps_per_hour that cannot be converted to an int gives input errors instead of raising
+        when time-series are validated against it
+        :return: None
+        """
+        post = copy.deepcopy(self.post)
+        post['Scenario']['time_steps_per_hour'] = {}
+        post['Scenario']['Site']['LoadProfile']['loads_kw'] = [1.0] * 35040
+        validator = self.get_validator(post)
+        self.assertEquals(validator.isValid, False)
+        assert(any('Could not convert time_steps_per_hour' in e for e in validator.errors['input_errors']))
+        assert(any('time_steps_per_hour value ({}) in Scenario not in allowable inputs - [1, 2, 4]' in e
+                   for e in validator.errors['input_errors']))
+
+    def test_non_numeric_load_profile(self):
+        """
+        confirm that a sub-hourly load profile with a non-numeric value gives an input error instead of raising
+        :return: None
+        """
+        post = copy.deepcopy(self.post)
+        post['Scenario']['Site']['LoadProfile']['loads_kw'] = [1.0] * 35039 + ['a']
+        validator = self.get_validator(post)
+        self.assertEquals(validator.isValid, False)
+        assert('loads_kw must be numeric.' in validator.errors['input_errors'])
+
+    def test_non_numeric_wind_resource(self):
+        """
+        confirm that a sub-hourly Wind resource series with a non-numeric value gives an input error instead of raising,
+        while the other series (which are downsampled together) are still downsampled
+        :return: None
+        """
+        post = copy.deepcopy(self.post)
+        post['Scenario']['Site']['Wind'] = {
+            'max_kw': 100,
+            'wind_meters_per_sec': [1.0] * 35040,
+            'wind_direction_degrees': [1.0] * 35039 + ['calm'],
+            'temperature_celsius': [1.0] * 35040,
+            'pressure_atmospheres': [1.0] * 35040,
+        }
+        validator = self.get_validator(post)
+        self.assertEquals(validator.isValid, False)
+        assert('wind_direction_degrees must be numeric.' in validator.errors['input_errors'])
+        for attr_name in ['wind_meters_per_sec', 'temperature_celsius', 'pressure_atmospheres']:
+            self.assertEquals(len(validator.input_dict['Scenario']['Site']['Wind'][attr_name]), 8760)
+
+    def test_wind_resource_mixed_resolutions(self):
+        """
+        confirm that Wind resource series of different resolutions are each downsampled to hourly
+        :return: None
+        """
+        post = copy.deepcopy(self.post)
+        post['Scenario']['Site']['Wind'] = {
+            'max_kw': 100,
+            'wind_meters_per_sec': [float(i % 4) for i in range(35040)],
+            'wind_direction_degrees': [float(i % 2) for i in range(17520)],
+            'temperature_celsius': [1.0] * 8760,
+            'pressure_atmospheres': [1.0] * 35040,
+        }
+        validator = self.get_validator(post)
+        self.assertEquals(validator.isValid, True)
+        wind = validator.input_dict['Scenario']['Site']['Wind']
+        for attr_name in ['wind_meters_per_sec', 'wind_direction_degrees', 'temperature_celsius',
+                          'pressure_atmospheres']:
+            self.assertEquals(len(wind[attr_name]), 8760)
+        self.assertEquals(wind['wind_meters_per_sec'], [1.5] * 8760)
+        self.assertEquals(wind['wind_direction_degrees'], [0.5] * 8760)
+        resampled = validator.warnings['Following inputs were resampled:']['Wind']
+        assert('Downsampled wind_meters_per_sec from 15 minute resolution' in resampled)
+        assert('Downsampled wind_direction_degrees from 30 minute resolution' in resampled)
+
+    def test_user_uuid(self):
+        """
+        confirm the forms of user_uuid that are accepted (with braces, with a urn:uuid: prefix, without dashes,
+        uppercase) and some that are rejected, including the 0x and + prefixed strings that uuid.UUID accepts
+        :return: None
+        """
+        valid_uuid = '12345678-1234-5678-1234-567812345678'
+        good_uuids = [valid_uuid, '{' + valid_uuid + '}', 'urn:uuid:' + valid_uuid, valid_uuid.replace('-', ''),
+                      'ABCDEF01-ABCD-ABCD-ABCD-ABCDEF012345']
+        bad_uuids = ['not-a-uuid', valid_uuid[:-1], valid_uuid + '0', valid_uuid.replace('1', 'g'),
+                     '0x' + 'a' * 30, '+' + 'a' * 31]
+
+        for user_uuid in good_uuids + bad_uuids:
+            post = copy.deepcopy(self.post)
+            post['Scenario']['user_uuid'] = user_uuid
+            validator = self.get_validator(post)
+
+            if user_uuid in good_uuids:
+                self.assertEquals(validator.isValid, True)
+            else:
+                self.assertEquals(validator.isValid, False)
+                assert('user_uuid must be a valid UUID' in validator.errors['input_errors'])
+
+    def test_urdb_rate_cache(self):
+        """
+        confirm that a rate downloaded by urdb_label is reused for the next request with the same label, while a rate
+        looked up by urdb_utility_name and urdb_rate_name is downloaded for every request
+        :return: None
+        """
+        urdb_response = self.post['Scenario']['Site']['ElectricTariff'].pop('urdb_response')
+        validators._urdb_rate_cache.clear()
+        try:
+            with patch('reo.validators.Rate') as rate:
+                rate.return_value.urdb_dict = urdb_response
+
+                for _ in range(2):
+                    post = copy.deepcopy(self.post)
+                    post['Scenario']['Site']['ElectricTariff']['urdb_label'] = 'test_urdb_label'
+                    validator = self.get_validator(post)
+                    self.assertEquals(validator.input_dict['Scenario']['Site']['ElectricTariff']['urdb_response'],
+                                      urdb_response)
+                rate.assert_called_once_with(rate='test_urdb_label')
+
+                rate.reset_mock()
+                for _ in range(2):
+                    validator = self.get_validator(copy.deepcopy(self.post))
+                    self.assertEquals(validator.input_dict['Scenario']['Site']['ElectricTariff']['urdb_response'],
+                                      urdb_response)
+                self.assertEquals(rate.call_count, 2)
+        finally:
+            validators._urdb_rate_cache.clear()
+
+    def test_max_input_errors(self):
+        """
+        confirm that time-series are no longer validated or resampled once _MAX_INPUT_ERRORS input errors are collected
+        :return: None
+        """
+        validator = self.get_validator(copy.deepcopy(self.post))
+        validator.input_data_errors.extend(['test error'] * validators._MAX_INPUT_ERRORS)
+        validator.validate_8760([1.0] * 8759, "LoadProfile", "loads_kw", 1)
+        validator.validate_8760([1.0] * 35040, "LoadProfile", "critical_loads_kw", 1)
+        self.assertEquals(len(validator.input_data_errors), validators._MAX_INPUT_ERRORS)
+        self.assertEquals(validator.resampled_inputs, [])
+
+        validator.input_data_errors.pop()
+        validator.validate_8760([1.0] * 8759, "LoadProfile", "loads_kw", 1)
+        assert('Invalid length for loads_kw' in validator.input_data_errors[-1])
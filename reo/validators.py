@@ -28,7 +28,6 @@
 # OF THE POSSIBILITY OF SUCH DAMAGE.
 # *********************************************************************************
 import numpy as np
-import pandas as pd
 from .urdb_logger import log_urdb_errors
 from .nested_inputs import nested_input_definitions, list_of_float
 #Note: list_of_float is actually needed
@@ -36,24 +35,308 @@ import os
 import csv
 import copy
 from reo.src.urdb_rate import Rate
-import re
-import uuid
+import bisect
+import string
+from collections import OrderedDict, namedtuple
+from functools import lru_cache
 from reo.src.techs import Generator
+from reo.src.load_profile import BuiltInProfile
+from reo.src.wind_resource import get_conic_coords
 
 hard_problems_csv = os.path.join('reo', 'hard_problems.csv')
-hard_problem_labels = [i[0] for i in csv.reader(open(hard_problems_csv, 'r'))]
+with open(hard_problems_csv, 'r', newline='') as f:
+    hard_problem_labels = frozenset(i[0] for i in csv.reader(f) if i)
+
+# str.translate tables for ValidateNestedInput.validate_text_fields that delete the allowed characters of a text field
+# (by default), Scenario description, and Site address, so anything left is invalid
+_TEXT_FIELD_STRIP = str.maketrans('', '', string.digits + string.ascii_letters + '- $:;)(*&#!@')
+_DESCRIPTION_STRIP = str.maketrans('', '', string.digits + string.ascii_letters + '-. $:;)(*&#_!@')
+_ADDRESS_STRIP = str.maketrans('', '', string.digits + string.ascii_letters + '. ')
+
+
+def _downsample_mean(values, factor):
+    """
+    Average each consecutive group of factor samples, eg. factor = 4 for 15 minute samples to hourly
+    :param values: numpy.ndarray of float64, one time-series or a stack of time-series (one per row) with a length
+        that is a multiple of factor
+    :param factor: int
+    :return: numpy.ndarray of the len / factor means of each time-series
+    """
+    return values.reshape(values.shape[:-1] + (-1, factor)).mean(axis=-1)
+
+
+# Wind size_class by average load, with the upper limit (inclusive) of average load for each class but the last
+_WIND_SIZE_CLASS_MAX_LOADS_KW = (12.5, 100, 1000)
+_WIND_SIZE_CLASSES = ('residential', 'commercial', 'medium', 'large')
+
+# allowed lengths of time-series inputs: hourly, 30 minute, and 15 minute samples for one year
+_TIME_SERIES_LENGTHS = frozenset((8760, 17520, 35040))
+
+# once this many input errors are collected the request is clearly invalid, so validate_8760 stops resampling series
+_MAX_INPUT_ERRORS = 200
+
+# messages of validate_8760, formatted with the time-series name (and the resolution in minutes to downsample hourly)
+_INVALID_LENGTH_MESSAGE = "Invalid length for %s. Samples must be hourly (8,760 samples), 30 minute (17,520 samples), " \
+                          "or 15 minute (35,040 samples)"
+_HOURLY_DOWNSAMPLE_MESSAGE = "Downsampled %s from %d minute resolution to hourly resolution to match " \
+                             "time_steps_per_hour via average."
+_15_TO_30_MINUTE_MESSAGE = "Downsampled %s from 15 minute resolution to 30 minute resolution to match " \
+                           "time_steps_per_hour via average."
+_30_TO_15_MINUTE_MESSAGE = "Upsampled %s from 30 minute resolution to 15 minute resolution to match " \
+                           "time_steps_per_hour via forward-fill."
+_HOURLY_TO_15_MINUTE_MESSAGE = "Upsampled %s from hourly resolution to 15 minute resolution to match " \
+                               "time_steps_per_hour via forward-fill."
+_HOURLY_TO_30_MINUTE_MESSAGE = "Upsampled %s from hourly resolution to 30 minute resolution to match " \
+                               "time_steps_per_hour via forward-fill."
+
+# Wind resource time-series, which are all validated when the user provides wind_meters_per_sec
+_WIND_RESOURCE_KEYS = ('wind_meters_per_sec', 'wind_direction_degrees', 'temperature_celsius', 'pressure_atmospheres')
+
+# ElectricTariff inputs that must have one value per month when provided
+_BLENDED_KEYS = ('blended_monthly_demand_charges_us_dollars_per_kw', 'blended_monthly_rates_us_dollars_per_kwh')
+
+# characters of a UUID string: hex digits and dashes, plus the braces and "urn:uuid:" prefix that uuid.UUID strips
+_UUID_CHARS = frozenset(string.hexdigits + '-{}urn:i')
+
+# the python type for each "type" name used in nested_input_definitions
+_TYPE_MAP = {'float': float, 'int': int, 'str': str, 'bool': bool, 'dict': dict, 'list_of_float': list_of_float}
+
+
+def _convert_list_of_float(value):
+    """
+    Same as nested_inputs.list_of_float, but a list of numbers (the usual time-series input) is converted in one NumPy
+    pass instead of calling float on every element
+    :param value: input value of a list_of_float attribute
+    :return: list of floats
+    """
+    if isinstance(value, list):
+        try:
+            array = np.asarray(value, dtype=np.float64)
+        except (TypeError, ValueError):
+            array = None
+        # NaN can come from None entries, which list_of_float rejects, so those lists take the slow path
+        if array is not None and array.ndim == 1 and not np.isnan(array).any():
+            return array.tolist()
+    return list_of_float(value)
+
+
+# note that keys starting with a character that has no case (eg. "_" or a digit) are both "upper" and "lower" case
+@lru_cache(maxsize=1024)
+def _is_singular_key(k):
+    return not k[:1].islower() and not k.endswith('s')
+
+
+@lru_cache(maxsize=1024)
+def _is_plural_key(k):
+    return not k[:1].islower() and k.endswith('s')
+
+
+@lru_cache(maxsize=1024)
+def _is_attribute(k):
+    return not k[:1].isupper()
+
+
+# flat tables of one object (dict) in nested_input_definitions, so that the validation passes do not have to search
+# through the definition dicts of every attribute:
+#   objects: ((key, sub-template), ...) for the singular keys (sub-objects)
+#   attributes: ((name, AttributeDefinition), ...) for the attribute keys
+#   min_max_attributes: ((name, type, min, max, restrict_to), ...) for attributes with any of min, max, or restrict_to
+#   dependent_attributes: ((name, replacement_sets, depends_on), ...) for attributes with either
+#   required_attributes: (name, ...) for attributes with required == True
+#   required_keys: frozenset of the names in dependent_attributes (and their depends_on) and required_attributes, if
+#       all of them have values then nothing is missing
+#   defaults: ((key, default, wrap_default_in_list, is_object), ...) in template order, for attributes with a default
+#       and for the singular keys (which default to an empty object)
+#   check_min_max: function(real_values, errors, object_name_str) generated from min_max_attributes
+SchemaNode = namedtuple('SchemaNode', ['objects', 'attributes', 'min_max_attributes', 'dependent_attributes',
+                                       'required_attributes', 'required_keys', 'defaults', 'check_min_max'])
+
+# the parts of an attribute's definition in nested_input_definitions that are used in validation, None if not defined
+AttributeDefinition = namedtuple('AttributeDefinition', ['type', 'default', 'min', 'max', 'restrict_to',
+                                                         'replacement_sets', 'depends_on', 'required'])
+
+
+def _compile_min_max_check(min_max_attributes):
+    """
+    Generate a straight-line function that does the checks of ValidateNestedInput.check_min_max_restrictions for one
+    object, with the attribute names, types, and limits written into the source instead of looked up for every input
+    :param min_max_attributes: SchemaNode.min_max_attributes
+    :return: function(real_values, errors, object_name_str), appends error messages to errors
+    """
+    namespace = {'_TYPE_MAP': _TYPE_MAP}
+    lines = ['def check_min_max(real_values, errors, object_name_str):', '    get = real_values.get']
+
+    for i, (name, attribute_type, min_value, max_value, restrict_to) in enumerate(min_max_attributes):
+        # limits and types are passed in through the namespace so that their reprs do not matter
+        namespace.update({'name_%d' % i: name, 'min_%d' % i: min_value, 'max_%d' % i: max_value,
+                          'restrict_to_%d' % i: restrict_to,
+                          'type_%d' % i: float if isinstance(attribute_type, list) else _TYPE_MAP[attribute_type]})
+        lines += ['    value = get(name_%d)' % i, '    if value is not None:']
+        indent = '        '
+        if "list_of_float" in attribute_type:
+            lines += ['        if isinstance(value, list):']
+            if min_value is not None:
+                lines += ['            if value and min(value) < min_%d:' % i,
+                          '                errors.append(\'At least one value in %%s (from %%s) exceeds allowable min of '
+                          '%%s\' %% (name_%d, object_name_str, min_%d))' % (i, i)]
+            if max_value is not None:
+                lines += ['            if value and max(value) > max_%d:' % i,
+                          '                errors.append(\'At least one value in %%s (from %%s) exceeds the allowable max '
+                          'of %%s\' %% (name_%d, object_name_str, max_%d))' % (i, i)]
+            lines += ['            value = None  # list values are not checked against restrict_to', '        else:']
+            indent = '            '
+        lines += [indent + 'try:',
+                  indent + '    value = type_%d(value)' % i,
+                  indent + 'except:',
+                  indent + '    errors.append(\'Could not check min/max on %%s (%%s) in %%s\' %% (name_%d, value, '
+                           'object_name_str))' % i]
+        if min_value is not None or max_value is not None:
+            lines += [indent + 'else:']
+            if min_value is not None:
+                lines += [indent + '    if value < min_%d:' % i,
+                          indent + '        errors.append(\'%%s value (%%s) in %%s exceeds allowable min %%s\' %% ('
+                                   'name_%d, value, object_name_str, min_%d))' % (i, i)]
+            if max_value is not None:
+                lines += [indent + '    if value > max_%d:' % i,
+                          indent + '        errors.append(\'%%s value (%%s) in %%s exceeds allowable max %%s\' %% ('
+                                   'name_%d, value, object_name_str, max_%d))' % (i, i)]
+        if restrict_to is not None:
+            lines += ['        if value is not None and value not in restrict_to_%d:' % i,
+                      '            errors.append(\'%%s value (%%s) in %%s not in allowable inputs - %%s\' %% ('
+                      'name_%d, value, object_name_str, restrict_to_%d))' % (i, i)]
+
+    exec('\n'.join(lines), namespace)
+    return namespace['check_min_max']
+
+
+def _compile_schema_node(template):
+    """
+    Build the SchemaNode for one object of a nested template
+    :param template: dict, eg. nested_input_definitions['Scenario']['Site']
+    :return: SchemaNode
+    """
+    attributes = tuple((k, AttributeDefinition(*(v.get(field) for field in AttributeDefinition._fields)))
+                       for k, v in template.items() if _is_attribute(k))
+    min_max_attributes = tuple((k, a.type, a.min, a.max, a.restrict_to) for k, a in attributes
+                               if a.min is not None or a.max is not None or a.restrict_to is not None)
+
+    definitions = dict(attributes)
+    defaults = []
+    for k in template:
+        a = definitions.get(k)
+        if a is not None and a.default is not None:
+            # attributes that can be a float or list_of_float are stored as lists, so their defaults are too
+            defaults.append((k, a.default, isinstance(a.type, list) and 'list_of_float' in a.type, False))
+        if _is_singular_key(k):
+            defaults.append((k, None, False, True))
+
+    dependent_attributes = tuple((k, a.replacement_sets, a.depends_on or []) for k, a in attributes
+                                 if a.replacement_sets is not None or a.depends_on)
+    required_attributes = tuple(k for k, a in attributes if a.required == True)
+    required_keys = frozenset(required_attributes).union(
+        *([k] + depends_on for k, replacements, depends_on in dependent_attributes))
+
+    return SchemaNode(
+        objects=tuple((k, v) for k, v in template.items() if _is_singular_key(k)),
+        attributes=attributes,
+        min_max_attributes=min_max_attributes,
+        dependent_attributes=dependent_attributes,
+        required_attributes=required_attributes,
+        required_keys=required_keys,
+        defaults=tuple(defaults),
+        check_min_max=_compile_min_max_check(min_max_attributes),
+    )
+
+
+def _compile_schema(nested_template, schema=None):
+    """
+    Depth first search of nested_template, compiling every object into a SchemaNode
+    :param nested_template: nested dictionary, eg. nested_input_definitions
+    :param schema: dict to fill, {id(template dict): SchemaNode}
+    :return: schema
+    """
+    if schema is None:
+        schema = {}
+    node = _compile_schema_node(nested_template)
+    schema[id(nested_template)] = node
+    for k, v in node.objects:
+        _compile_schema(v, schema)
+    return schema
+
+
+def _get_schema_node(template):
+    """
+    :param template: dict, an object in nested_input_definitions (or any other nested template)
+    :return: SchemaNode, compiled at import for nested_input_definitions and on the fly for anything else
+    """
+    return _schema.get(id(template)) or _compile_schema_node(template)
+
+
+# URDB rate dicts keyed by urdb_label, oldest entries are dropped first. Only labels are cached: a label identifies
+# one version of a rate, whereas a urdb_rate_name resolves to whatever rate URDB currently lists under that name.
+_urdb_rate_cache = OrderedDict()
+_urdb_rate_cache_size = 256
+
+
+def _get_urdb_rate(label):
+    """
+    Download a rate from URDB by label, or reuse the rate downloaded for an earlier validation in this process
+    :param label: str, urdb_label
+    :return: dict, a copy of Rate.urdb_dict (since it is stored in and modified with the inputs), or None if the rate
+        could not be found (which is not cached so that the download is tried again next time)
+    """
+    urdb_dict = _urdb_rate_cache.pop(label, None)
+    if urdb_dict is None:
+        urdb_dict = Rate(rate=label).urdb_dict
+        if urdb_dict is None:
+            return None
+        if len(_urdb_rate_cache) >= _urdb_rate_cache_size:
+            _urdb_rate_cache.popitem(last=False)
+    _urdb_rate_cache[label] = urdb_dict  # (re)insert as most recently used
+    return copy.deepcopy(urdb_dict)
+
+
+# nested_input_definitions lives for the life of the process, so the ids of its dicts are stable keys
+_schema = _compile_schema(nested_input_definitions)
 
 
 class URDB_RateValidator:
 
+    # the URDB fields listed in __init__ (plus those that are validated) are the only attributes a rate can set
+    __slots__ = (
+        'errors', 'warnings',
+        'label', 'utility', 'name', 'uri', 'approved', 'startdate', 'enddate', 'supercedes', 'sector', 'description',
+        'source', 'sourceparent', 'basicinformationcomments', 'peakkwcapacitymin', 'peakkwcapacitymax',
+        'peakkwcapacityhistory', 'peakkwhusagemin', 'peakkwhusagemax', 'peakkwhusagehistory', 'voltageminimum',
+        'voltagemaximum', 'voltagecategory', 'phasewiring', 'flatdemandunit', 'flatdemandstructure', 'flatdemandmonths',
+        'demandrateunit', 'demandratestructure', 'demandweekdayschedule', 'demandweekendschedule',
+        'demandratchetpercentage', 'demandwindow', 'demandreactivepowercharge', 'coincidentrateunit',
+        'coincidentratestructure', 'coincidentrateschedule', 'demandattrs', 'demandcomments', 'usenetmetering',
+        'energyratestructure', 'energyweekdayschedule', 'energyweekendschedule', 'energyattrs', 'energycomments',
+        'fixedmonthlycharge', 'minmonthlycharge', 'annualmincharge',
+    )
+
     error_folder = 'urdb_rate_errors'
 
+    # map to tell if a field requires one or more other fields
+    dependencies = {
+
+        'demandweekdayschedule': ('demandratestructure',),
+        'demandweekendschedule': ('demandratestructure',),
+        'demandratestructure': ('demandweekdayschedule', 'demandweekendschedule'),
+        'energyweekdayschedule': ('energyratestructure',),
+        'energyweekendschedule': ('energyratestructure',),
+        'energyratestructure': ('energyweekdayschedule', 'energyweekendschedule'),
+        'flatdemandmonths': ('flatdemandstructure',),
+        'flatdemandstructure': ('flatdemandmonths',),
+    }
+
     def __init__(self,_log_errors=True, **kwargs):
         """
         Takes a dictionary parsed from a URDB Rate Json response
         - See http://en.openei.org/services/doc/rest/util_rates/?version=3
 
-        Rates may or mat not have the following keys:
+        Rates may or mat not have the following keys (any other keys are ignored):
 
             label                       Type: string
             utility                     Type: string
@@ -104,7 +387,8 @@ class URDB_RateValidator:
         self.warnings = []                           #Catch Warnings
         kwargs.setdefault("label", "custom")
         for key in kwargs:                           #Load in attributes
-            setattr(self, key, kwargs[key])
+            if key in _urdb_rate_fields:
+                setattr(self, key, kwargs[key])
 
         self.validate()                              #Validate attributes
 
@@ -119,26 +403,10 @@ class URDB_RateValidator:
             self.errors.append("URDB Rate (label={}) is currently restricted due to performance limitations".format(self.label))
 
          # Validate each attribute with custom valdidate function
-        for key in dir(self):
-            v = 'validate_' + key
-            if hasattr(self, v):
+        for key, v in _urdb_validators:
+            if hasattr(self, key):
                 getattr(self, v)()
 
-    @property
-    def dependencies(self):
-        # map to tell if a field requires one or more other fields
-        return {
-
-            'demandweekdayschedule': ['demandratestructure'],
-            'demandweekendschedule': ['demandratestructure'],
-            'demandratestructure':['demandweekdayschedule','demandweekendschedule'],
-            'energyweekdayschedule': ['energyratestructure'],
-            'energyweekendschedule': ['energyratestructure'],
-            'energyratestructure':['energyweekdayschedule','energyweekendschedule'],
-            'flatdemandmonths': ['flatdemandstructure'],
-            'flatdemandstructure': ['flatdemandmonths'],
-        }
-
     @property
     def isValid(self):
         #True if no errors found during validation on init
@@ -148,61 +416,83 @@ class URDB_RateValidator:
 
     def validate_demandratestructure(self):
         name = 'demandratestructure'
-        if self.validDependencies(name):
-            self.validRate(name)
+        value = getattr(self, name, None)
+        if self.validDependencies(name) and value is not None:
+            self.validRate(name, value)
 
     def validate_demandweekdayschedule(self):
         name = 'demandweekdayschedule'
-        self.validCompleteHours(name, [12,24])
-        if self.validDependencies(name):
-            self.validSchedule(name, 'demandratestructure')
+        value = getattr(self, name, None)
+        if value is not None:
+            self.validCompleteHours(name, value, [12,24])
+        if self.validDependencies(name) and value is not None:
+            rate = 'demandratestructure'
+            self.validSchedule(name, value, rate, getattr(self, rate, None))
 
     def validate_demandweekendschedule(self):
         name = 'demandweekendschedule'
-        self.validCompleteHours(name, [12,24])
-        if self.validDependencies(name):
-            self.validSchedule(name, 'demandratestructure')
+        value = getattr(self, name, None)
+        if value is not None:
+            self.validCompleteHours(name, value, [12,24])
+        if self.validDependencies(name) and value is not None:
+            rate = 'demandratestructure'
+            self.validSchedule(name, value, rate, getattr(self, rate, None))
 
     def validate_energyweekendschedule(self):
         name = 'energyweekendschedule'
-        self.validCompleteHours(name, [12,24])
-        if self.validDependencies(name):
-            self.validSchedule(name, 'energyratestructure')
+        value = getattr(self, name, None)
+        if value is not None:
+            self.validCompleteHours(name, value, [12,24])
+        if self.validDependencies(name) and value is not None:
+            rate = 'energyratestructure'
+            self.validSchedule(name, value, rate, getattr(self, rate, None))
 
     def validate_energyweekdayschedule(self):
         name = 'energyweekdayschedule'
-        self.validCompleteHours(name, [12,24])
-        if self.validDependencies(name):
-            self.validSchedule(name, 'energyratestructure')
+        value = getattr(self, name, None)
+        if value is not None:
+            self.validCompleteHours(name, value, [12,24])
+        if self.validDependencies(name) and value is not None:
+            rate = 'energyratestructure'
+            self.validSchedule(name, value, rate, getattr(self, rate, None))
 
     def validate_energyratestructure(self):
         name = 'energyratestructure'
-        if self.validDependencies(name):
-            self.validRate(name)
+        value = getattr(self, name, None)
+        if self.validDependencies(name) and value is not None:
+            self.validRate(name, value)
 
     def validate_flatdemandstructure(self):
         name = 'flatdemandstructure'
-        if self.validDependencies(name):
-            self.validRate(name)
+        value = getattr(self, name, None)
+        if self.validDependencies(name) and value is not None:
+            self.validRate(name, value)
 
     def validate_flatdemandmonths(self):
         name = 'flatdemandmonths'
-        self.validCompleteHours(name, [12])
-        if self.validDependencies(name):
-            self.validSchedule(name, 'flatdemandstructure')
+        value = getattr(self, name, None)
+        if value is not None:
+            self.validCompleteHours(name, value, [12])
+        if self.validDependencies(name) and value is not None:
+            rate = 'flatdemandstructure'
+            self.validSchedule(name, value, rate, getattr(self, rate, None))
 
     def validate_coincidentratestructure(self):
         name = 'coincidentratestructure'
-        if self.validDependencies(name):
-            self.validRate(name)
+        value = getattr(self, name, None)
+        if self.validDependencies(name) and value is not None:
+            self.validRate(name, value)
 
     def validate_coincidentrateschedule(self):
         name = 'coincidentrateschedule'
-        if self.validDependencies(name):
-            self.validSchedule(name, 'flatdemandstructure')
+        value = getattr(self, name, None)
+        if self.validDependencies(name) and value is not None:
+            rate = 'flatdemandstructure'
+            self.validSchedule(name, value, rate, getattr(self, rate, None))
 
 
     #### FUNCTIONS TO VALIDATE ATTRIBUTES ####
+    # the validate_<attribute name> functions fetch each attribute once and pass its value (never None) to these checks
 
     def validDependencies(self, name):
         # check that all dependent attributes exist
@@ -212,85 +502,88 @@ class URDB_RateValidator:
         valid = True
         if all_dependencies is not None:
             for d in all_dependencies:
-                error = False
-                if hasattr(self,d):
-                    if getattr(self,d) is None:
-                        error = True
-                else:
-                    error=True
-
-                if error:
+                if getattr(self, d, None) is None:
                     self.errors.append("Missing %s a dependency of %s" % (d, name))
                     valid = False
 
         return valid
 
-    def validCompleteHours(self, schedule_name,expected_counts):
+    def validCompleteHours(self, schedule_name, schedule, expected_counts):
         # check that each array in a schedule contains the correct number of entries
         # return Boolean if any errors found
+        valid = True
 
-        if hasattr(self,schedule_name):
-            valid = True
-            schedule = getattr(self,schedule_name)
-
-            def recursive_search(item,level=0, entry=0):
-                if type(item) == list:
-                    if len(item) != expected_counts[level]:
-                        msg = 'Entry {} {}{} does not contain {} entries'.format(entry,'in sublevel ' + str(level)+ ' ' if level>0 else '', schedule_name, expected_counts[level])
-                        self.errors.append(msg)
-                        valid = False
-                    for ii,subitem in enumerate(item):
-                        recursive_search(subitem,level=level+1, entry=ii)
-            recursive_search(schedule)
+        # fast path: a complete schedule converts to an array of exactly the expected shape
+        try:
+            if np.asarray(schedule).shape == tuple(expected_counts):
+                return valid
+        except ValueError:  # ragged schedule
+            pass
+
+        def recursive_search(item,level=0, entry=0):
+            nonlocal valid
+            if type(item) == list:
+                if len(item) != expected_counts[level]:
+                    msg = 'Entry {} {}{} does not contain {} entries'.format(entry,'in sublevel ' + str(level)+ ' ' if level>0 else '', schedule_name, expected_counts[level])
+                    self.errors.append(msg)
+                    valid = False
+                for ii,subitem in enumerate(item):
+                    recursive_search(subitem,level=level+1, entry=ii)
+        recursive_search(schedule)
         return valid
 
-    def validRate(self, rate):
+    def validRate(self, rate_name, rate_value):
         # check that each  tier in rate structure array has a rate attribute, and that all rates except one contain a 'max' attribute
         # return Boolean if any errors found
-        if hasattr(self,rate):
-            valid = True
-
-            for i, r in enumerate(getattr(self, rate)):
-                if len(r) == 0:
-                    self.errors.append('Missing rate information for rate ' + str(i) + ' in ' + rate)
-                    valid = False
-                num_max_tags = 0
-                for ii, t in enumerate(r):
-                    if t.get('max') is not None:
-                        num_max_tags +=1
-                    if t.get('rate') is None and t.get('sell') is None and t.get('adj') is None:
-                        self.errors.append('Missing rate/sell/adj attributes for tier ' + str(ii) + " in rate " + str(i) + ' ' + rate)
-                        valid = False
-                if len(r) > 1:
-                    num_missing_max_tags = len(r) - 1 - num_max_tags
-                    if num_missing_max_tags > 0:
-                        self.errors.append("Missing 'max' tag for {} tiers in rate {} for {}".format( num_missing_max_tags, i, rate ))
-                        valid = False
-            return valid
-        return False
-
-    def validSchedule(self, schedules, rate):
+        errors = []  # added to self.errors once at the end
+
+        for i, r in enumerate(rate_value):
+            n = len(r)
+            if n == 0:
+                errors.append(f'Missing rate information for rate {i} in {rate_name}')
+                continue
+            num_max_tags = 0
+            for ii, t in enumerate(r):
+                get = t.get
+                if get('max') is not None:
+                    num_max_tags +=1
+                if get('rate') is None and get('sell') is None and get('adj') is None:
+                    errors.append(f'Missing rate/sell/adj attributes for tier {ii} in rate {i} {rate_name}')
+            num_missing_max_tags = n - 1 - num_max_tags
+            if n > 1 and num_missing_max_tags > 0:
+                errors.append(f"Missing 'max' tag for {num_missing_max_tags} tiers in rate {i} for {rate_name}")
+
+        self.errors.extend(errors)
+        return not errors
+
+    def validSchedule(self, name, schedule_value, rate_name, rate_value):
         # check that each rate an a schedule array has a valid set of tiered rates in the associated rate struture attribute
         # return Boolean if any errors found
-        if hasattr(self,schedules):
-            valid = True
-            s = getattr(self, schedules)
-            if isinstance(s[0],list):
-                s = np.concatenate(s)
-
-            periods = list(set(s))
-
-            # Loop though all periond and catch error if if exists
-            if hasattr(self,rate):
-                for period in periods:
-                    if period > len(getattr(self, rate)) - 1 or period < 0:
-                        self.errors.append(
-                            '%s contains value %s which has no associated rate in %s' % (schedules, period, rate))
-                        valid = False
-                return valid
-            else:
-                self.warnings.append('{} does not exist to check {}'.format(rate,schedules))
-        return False
+        s = schedule_value
+        if isinstance(s[0],list):
+            try:  # a complete (month x hour) schedule converts in one allocation
+                flat = np.asarray(s)
+            except ValueError:  # ragged schedule
+                flat = None
+            s = flat.ravel() if flat is not None and flat.ndim == 2 else np.concatenate(s)
+        else:
+            s = np.asarray(s)
+
+        # Check the range of periods and catch an error for each period without a rate
+        if rate_value is None:
+            self.warnings.append(f'{rate_name} does not exist to check {name}')
+            return False
+        max_period = len(rate_value) - 1
+        if s.size > 0 and (s.min() < 0 or s.max() > max_period):
+            self.errors.extend(
+                f'{name} contains value {period} which has no associated rate in {rate_name}'
+                for period in np.unique(s[(s < 0) | (s > max_period)]).tolist())
+            return False
+        return True
+
+# (attribute name, validate_<attribute name>) pairs, sorted by attribute name to keep the order that dir() gave
+_urdb_validators = tuple(sorted((k[len('validate_'):], k) for k in vars(URDB_RateValidator) if k.startswith('validate_')))
+_urdb_rate_fields = frozenset(URDB_RateValidator.__slots__) - {'errors', 'warnings'}
 
 
 class ValidateNestedInput:
@@ -374,6 +667,8 @@ class ValidateNestedInput:
             self.invalid_inputs = []
             self.resampled_inputs = []
             self.defaults_inserted = []
+            self._errors = None  # (lengths of the error lists, errors), see errors
+            self._warnings = None  # (lengths of the warning lists, warnings), see warnings
             self.input_dict = dict()
             self.input_dict['Scenario'] = input_dict.get('Scenario') or {}
 
@@ -381,13 +676,17 @@ class ValidateNestedInput:
                 if k != 'Scenario':
                     self.invalid_inputs.append([k, ["Top Level"]])
 
-            self.recursively_check_input_dict(self.nested_input_definitions, self.remove_invalid_keys)
-            self.recursively_check_input_dict(self.input_dict, self.remove_nones)
-            self.recursively_check_input_dict(self.nested_input_definitions, self.convert_data_types)
-            self.recursively_check_input_dict(self.nested_input_definitions, self.fillin_defaults)
-            self.recursively_check_input_dict(self.nested_input_definitions, self.check_min_max_restrictions)
-            self.recursively_check_input_dict(self.nested_input_definitions, self.check_required_attributes)
-            self.recursively_check_input_dict(self.nested_input_definitions, self.check_special_cases)
+            # every object is cleaned, converted, filled in, and checked in one traversal; check_special_cases gets
+            # its own traversal because it depends on other objects (and self.isValid) being fully processed.
+            # input_errors are therefore grouped by object (eg. an object's min/max errors come before the conversion
+            # errors of objects visited after it), and special case errors (eg. time-series lengths) come last
+            self.recursively_check_input_dict(self.nested_input_definitions, [self.remove_invalid_keys,
+                                                                              self.remove_nones,
+                                                                              self.convert_data_types,
+                                                                              self.fillin_defaults,
+                                                                              self.check_min_max_restrictions,
+                                                                              self.check_required_attributes])
+            self.recursively_check_input_dict(self.nested_input_definitions, [self.check_special_cases])
 
         @property
         def isValid(self):
@@ -400,11 +699,13 @@ class ValidateNestedInput:
         def messages(self):
             output = {}
 
-            if self.errors != {}:
-                output = self.errors
+            errors = self.errors
+            if errors != {}:
+                output = dict(errors)  # copy, since errors is cached
 
-            if self.warnings != {}:
-                output['warnings'] = self.warnings
+            warnings = self.warnings
+            if warnings != {}:
+                output['warnings'] = warnings
 
             return output
 
@@ -416,15 +717,16 @@ class ValidateNestedInput:
             """
             output = {}
             for arg, path in warnings:
-                path = ">".join(path)
-                if path not in output:
-                    output[path] = arg
-                else:
-                    output[path] += ' AND ' + arg
-            return output
+                output.setdefault(">".join(path), []).append(arg)
+            return {path: ' AND '.join(args) for path, args in output.items()}
 
         @property
         def errors(self):
+            # the error lists only grow, so the cached output is rebuilt only when one of their lengths changes
+            state = (len(self.input_data_errors), len(self.urdb_errors))
+            if self._errors is not None and self._errors[0] == state:
+                return self._errors[1]
+
             output = {}
 
             if self.input_data_errors:
@@ -432,16 +734,22 @@ class ValidateNestedInput:
                 output["input_errors"] = self.input_data_errors
 
             if self.urdb_errors and self.input_data_errors:
-                output["input_errors"] += self.urdb_errors
+                output["input_errors"] = self.input_data_errors + self.urdb_errors
 
             elif self.urdb_errors:
                 output["error"] = "Invalid inputs. See 'input_errors'."
                 output["input_errors"] = self.urdb_errors
 
+            self._errors = (state, output)
             return output
 
         @property
         def warnings(self):
+            # the warning lists only grow, so the cached output is rebuilt only when one of their lengths changes
+            state = (len(self.defaults_inserted), len(self.invalid_inputs), len(self.resampled_inputs))
+            if self._warnings is not None and self._warnings[0] == state:
+                return self._warnings[1]
+
             output = {}
 
             if bool(self.defaults_inserted):
@@ -453,6 +761,7 @@ class ValidateNestedInput:
             if bool(self.resampled_inputs):
                 output["Following inputs were resampled:"] = self.warning_message(self.resampled_inputs)
 
+            self._warnings = (state, output)
             return output
 
         def isSingularKey(self, k):
@@ -461,19 +770,20 @@ class ValidateNestedInput:
             :param k: str
             :return: True/False
             """
-            return k[0] == k[0].upper() and k[-1] != 's'
+            return _is_singular_key(k)
 
         def isPluralKey(self, k):
-            return k[0] == k[0].upper() and k[-1] == 's'
+            return _is_plural_key(k)
 
         def isAttribute(self, k):
-            return k[0] == k[0].lower()
+            return _is_attribute(k)
 
-        def recursively_check_input_dict(self, nested_template, comparison_function, nested_dictionary_to_check=None,
-                                         object_name_path=[]):
+        def recursively_check_input_dict(self, nested_template, comparison_functions, nested_dictionary_to_check=None,
+                                         object_name_path=[], object_name_str=''):
             """
-            Recursively perform comparison_function on nested_dictionary_to_check using nested_template as a guide for
-            the (key: value) pairs to be checked in nested_dictionary_to_check.
+            Recursively perform each of the comparison_functions, in order, on nested_dictionary_to_check using
+            nested_template as a guide for the (key: value) pairs to be checked in nested_dictionary_to_check.
+            All of the comparison_functions are applied to an object before descending into its sub-objects.
             comparison_function's include
                 - remove_invalid_keys
                 - remove_nones
@@ -481,27 +791,32 @@ class ValidateNestedInput:
                 - fillin_defaults
                 - check_min_max_restrictions
                 - check_required_attributes
+                - check_special_cases
                 - add_invalid_data (for testing)
             :param nested_template: nested dictionary, used as guide for checking nested_dictionary_to_check
-            :param comparison_function: one of the input data validation tasks listed above
+            :param comparison_functions: list of the input data validation tasks listed above
             :param nested_dictionary_to_check: data to be validated; default is self.input_dict
             :param object_name_path: list of str, used to keep track of keys necessary to access a value to check in the
                   nested_template / nested_dictionary_to_check
+            :param object_name_str: str, object_name_path joined with '>' (passed down so it is built once per object)
             :return: None
             """
             if nested_dictionary_to_check is None:
                 nested_dictionary_to_check = self.input_dict
 
-            for template_k, template_values in nested_template.items():
-                real_values = nested_dictionary_to_check.get(template_k)
+            # objects are the keys that are upper case and do not end in "s"
+            for template_k, template_values in _get_schema_node(nested_template).objects:
+                path = object_name_path + [template_k]
+                path_str = object_name_str + '>' + template_k if object_name_str else template_k
 
-                if self.isSingularKey(template_k):  # True if template_k is upper case and does not end in "s"
-                    comparison_function(object_name_path=object_name_path + [template_k],
-                                        template_values=template_values, real_values=real_values)
+                for comparison_function in comparison_functions:
+                    # re-get the real values since a previous comparison_function can create them (fillin_defaults)
+                    comparison_function(object_name_path=path, template_values=template_values,
+                                        real_values=nested_dictionary_to_check.get(template_k), object_name_str=path_str)
 
-                    self.recursively_check_input_dict(nested_template[template_k], comparison_function,
-                                                      real_values or {},
-                                                      object_name_path=object_name_path + [template_k])
+                self.recursively_check_input_dict(template_values, comparison_functions,
+                                                  nested_dictionary_to_check.get(template_k) or {},
+                                                  object_name_path=path, object_name_str=path_str)
 
         def update_attribute_value(self, object_name_path, attribute, value):
 
@@ -512,16 +827,6 @@ class ValidateNestedInput:
 
             dictionary[attribute] = value
 
-        def delete_attribute(self, object_name_path, key):
-
-            dictionary = self.input_dict
-
-            for name in object_name_path:
-                dictionary = dictionary[name]
-
-            if key in dictionary.keys():
-                del dictionary[key]
-
         def object_name_string(self, object_name_path):
             return '>'.join(object_name_path)
 
@@ -555,7 +860,7 @@ class ValidateNestedInput:
                     if validation_attribute == 'restrict_to':
                         bad_val = "OOPS"
                     if validation_attribute == 'type':
-                        if any(isinstance(good_val, x) for x in [float, int, dict, bool, list]):
+                        if isinstance(good_val, (float, int, dict, bool, list)):
                             bad_val = "OOPS"
 
                     if bad_val is not None:
@@ -563,18 +868,18 @@ class ValidateNestedInput:
                         test_data_list.append([name, copy.deepcopy(self.input_dict)])
                         self.update_attribute_value(object_name_path, name, good_val)
 
-            def add_invalid_data(object_name_path, template_values=None, real_values=None):
+            def add_invalid_data(object_name_path, template_values=None, real_values=None, object_name_str=None):
                 if real_values is not None:
                     for name, value in template_values.items():
                         if self.isAttribute(name):
                             swap_logic(object_name_path, name, value, real_values.get(name),
                                        validation_attribute=definition_attribute)
 
-            self.recursively_check_input_dict(self.nested_input_definitions, add_invalid_data)
+            self.recursively_check_input_dict(self.nested_input_definitions, [add_invalid_data])
 
             return test_data_list
 
-        def remove_nones(self, object_name_path, template_values=None, real_values=None):
+        def remove_nones(self, object_name_path, template_values=None, real_values=None, object_name_str=None):
             """
             comparison_function for recursively_check_input_dict.
             remove any `None` values from the input_dict.
@@ -586,17 +891,17 @@ class ValidateNestedInput:
             :param real_values: dict, the attributes corresponding to the object at object_name_path within the
                 input_dict to check and/or modify. For example, with a object_name_path of ["Scenario", "Site", "PV"]
                  the real_values would look like: {'latitude': 39.345678, 'longitude': -90.3, ... }
+            :param object_name_str: str, object_name_path joined with '>', eg. "Scenario>Site>PV"
             :return: None
             """
             if real_values is not None:
-                rv = copy.deepcopy(real_values)
-                for name, value in rv.items():
+                for name in list(real_values.keys()):  # snapshot the keys since attributes are deleted in the loop
                     if self.isAttribute(name):
-                        if value is None:
-                            self.delete_attribute(object_name_path, name)
+                        if real_values[name] is None:
+                            del real_values[name]
                             self.input_as_none.append([name, object_name_path[-1]])
 
-        def remove_invalid_keys(self, object_name_path, template_values=None, real_values=None):
+        def remove_invalid_keys(self, object_name_path, template_values=None, real_values=None, object_name_str=None):
             """
             comparison_function for recursively_check_input_dict.
             remove any input values provided by user that are not included in nested_input_definitions.
@@ -608,18 +913,18 @@ class ValidateNestedInput:
             :param real_values: dict, the attributes corresponding to the object at object_name_path within the
                 input_dict to check and/or modify. For example, with a object_name_path of ["Scenario", "Site", "PV"]
                  the real_values would look like: {'latitude': 39.345678, 'longitude': -90.3, ... }
+            :param object_name_str: str, object_name_path joined with '>', eg. "Scenario>Site>PV"
             :return: None
             """
             if real_values is not None:
-                rv = copy.deepcopy(real_values)
-                for name, value in rv.items():
+                for name in list(real_values.keys()):  # snapshot the keys since attributes are deleted in the loop
                     if self.isAttribute(name):
-                        if name not in template_values.keys():
-                            self.delete_attribute(object_name_path, name)
+                        if name not in template_values:
+                            del real_values[name]
                             self.invalid_inputs.append([name, object_name_path])
 
 
-        def check_special_cases(self, object_name_path, template_values=None, real_values=None):
+        def check_special_cases(self, object_name_path, template_values=None, real_values=None, object_name_str=None):
             """
             checks special input requirements not otherwise programatically captured by nested input definitions
             
@@ -630,6 +935,7 @@ class ValidateNestedInput:
             :param real_values: dict, the attributes corresponding to the object at object_name_path within the
                 input_dict to check and/or modify. For example, with a object_name_path of ["Scenario", "Site", "PV"]
                  the real_values would look like: {'latitude': 39.345678, 'longitude': -90.3, ... }
+            :param object_name_str: str, object_name_path joined with '>', eg. "Scenario>Site>PV"
             :return: None
             """
 
@@ -637,35 +943,26 @@ class ValidateNestedInput:
                 if real_values.get('user_uuid') is not None:
                     self.validate_user_uuid(user_uuid=real_values['user_uuid'], err_msg = "user_uuid must be a valid UUID")
                 if real_values.get('description') is not None:
-                    self.validate_text_fields(str = real_values['description'],
-                                              pattern = r'^[-0-9a-zA-Z.  $:;)(*&#_!@]*$',
-                              err_msg = "description can include enlisted special characters: [-0-9a-zA-Z.  $:;)(*&#_!@] and can have 0-9, a-z, A-Z, periods, and spaces.")
+                    self.validate_text_fields(value=real_values['description'], strip=_DESCRIPTION_STRIP,
+                              err_msg="description can include enlisted special characters: [-0-9a-zA-Z.  $:;)(*&#_!@] and can have 0-9, a-z, A-Z, periods, and spaces.")
             
             if object_name_path[-1] == "Site":
                 if real_values.get('address') is not None:
-                    self.validate_text_fields(str = real_values['address'], pattern = r'^[0-9a-zA-Z. ]*$',
-                              err_msg = "Site address must not include special characters. Restricted to 0-9, a-z, A-Z, periods, and spaces.")
+                    self.validate_text_fields(value=real_values['address'], strip=_ADDRESS_STRIP,
+                              err_msg="Site address must not include special characters. Restricted to 0-9, a-z, A-Z, periods, and spaces.")
             
             if object_name_path[-1] == "Wind":
-                if any((isinstance(real_values['max_kw'], x) for x in [float, int])):
+                if isinstance(real_values['max_kw'], (float, int)):
                     if real_values['max_kw'] > 0:
+                        site = self.input_dict['Scenario']['Site']
+                        wind = site['Wind']
+                        time_steps_per_hour = self.input_dict['Scenario']['time_steps_per_hour']
 
-                        if real_values.get("wind_meters_per_sec"):
-                            self.validate_8760(real_values.get("wind_meters_per_sec"),
-                                               "Wind", "wind_meters_per_sec", self.input_dict['Scenario']['time_steps_per_hour'])
-
-                            self.validate_8760(real_values.get("wind_direction_degrees"),
-                                               "Wind", "wind_direction_degrees", self.input_dict['Scenario']['time_steps_per_hour'])
-
-                            self.validate_8760(real_values.get("temperature_celsius"),
-                                               "Wind", "temperature_celsius", self.input_dict['Scenario']['time_steps_per_hour'])
-
-                            self.validate_8760(real_values.get("pressure_atmospheres"),
-                                               "Wind", "pressure_atmospheres", self.input_dict['Scenario']['time_steps_per_hour'])
+                        if wind.get("wind_meters_per_sec"):
+                            self.validate_8760_batch("Wind", [(attr_name, wind.get(attr_name)) for attr_name in
+                                                              _WIND_RESOURCE_KEYS], time_steps_per_hour)
                         else:
-                            from reo.src.wind_resource import get_conic_coords
-
-                            if self.input_dict['Scenario']['Site']['Wind'].get('size_class') is None:
+                            if wind.get('size_class') is None:
                                 """
                                 size_class is determined by average load. If using simulated load, then we have to get the ASHRAE
                                 climate zone from the DeveloperREOapi in order to determine the load profile (done in BuiltInProfile).
@@ -674,35 +971,30 @@ class ValidateNestedInput:
                                 handled in reo.src.load_profile, but due to the need for the average load here, the work-flow has been
                                 modified.
                                 """
+                                load_profile = site['LoadProfile']
 
                                 avg_load_kw = 0
-                                if self.input_dict['Scenario']['Site']['LoadProfile'].get('annual_kwh') is not None:
-                                    avg_load_kw = self.input_dict['Scenario']['Site']['LoadProfile'].get('annual_kwh') / 8760
+                                if load_profile.get('annual_kwh') is not None:
+                                    avg_load_kw = load_profile.get('annual_kwh') / 8760
 
-                                elif self.input_dict['Scenario']['Site']['LoadProfile'].get('loads_kw') in [None, []]:
+                                elif load_profile.get('loads_kw') in [None, []]:
 
-                                    from reo.src.load_profile import BuiltInProfile
-                                    b = BuiltInProfile(latitude=self.input_dict['Scenario']['Site']['latitude'],
-                                                       longitude=self.input_dict['Scenario']['Site']['longitude'],
-                                                       **self.input_dict['Scenario']['Site']['LoadProfile']
+                                    b = BuiltInProfile(latitude=site['latitude'],
+                                                       longitude=site['longitude'],
+                                                       **load_profile
                                                        )
-                                    self.input_dict['Scenario']['Site']['LoadProfile']['loads_kw'] = b.built_in_profile
+                                    loads_kw = b.built_in_profile  # a property, so only evaluate it once
+                                    load_profile['loads_kw'] = loads_kw
 
-                                    avg_load_kw = sum(self.input_dict['Scenario']['Site']['LoadProfile']['loads_kw'])\
-                                                  / len(self.input_dict['Scenario']['Site']['LoadProfile']['loads_kw'])
+                                    avg_load_kw = float(np.mean(loads_kw))
 
-                                if avg_load_kw <= 12.5:
-                                    self.input_dict['Scenario']['Site']['Wind']['size_class'] = 'residential'
-                                elif avg_load_kw <= 100:
-                                    self.input_dict['Scenario']['Site']['Wind']['size_class'] = 'commercial'
-                                elif avg_load_kw <= 1000:
-                                    self.input_dict['Scenario']['Site']['Wind']['size_class'] = 'medium'
-                                else:
-                                    self.input_dict['Scenario']['Site']['Wind']['size_class'] = 'large'
+                                # bisect_left so that an average load equal to a threshold gets the smaller class
+                                wind['size_class'] = \
+                                    _WIND_SIZE_CLASSES[bisect.bisect_left(_WIND_SIZE_CLASS_MAX_LOADS_KW, avg_load_kw)]
                             try:
                                 get_conic_coords(
-                                    lat=self.input_dict['Scenario']['Site']['latitude'],   
-                                    lng=self.input_dict['Scenario']['Site']['longitude'])
+                                    lat=site['latitude'],
+                                    lng=site['longitude'])
                             except Exception as e:
                                 self.input_data_errors.append(e.args[0])
 
@@ -731,27 +1023,27 @@ class ValidateNestedInput:
                     self.validate_urdb_response()
 
                 elif electric_tariff.get('urdb_label','') != '':
-                    rate = Rate(rate=electric_tariff.get('urdb_label'))
+                    urdb_dict = _get_urdb_rate(electric_tariff.get('urdb_label'))
 
-                    if rate.urdb_dict is None:
+                    if urdb_dict is None:
                         self.urdb_errors.append(
                             "Unable to download {} from URDB. Please check the input value for 'urdb_label'."
                                 .format(electric_tariff.get('urdb_label'))
                         )
                     else:
-                        electric_tariff['urdb_response'] = rate.urdb_dict
+                        electric_tariff['urdb_response'] = urdb_dict
                         self.validate_urdb_response()
 
                 elif electric_tariff.get('urdb_utility_name','') != '' and electric_tariff.get('urdb_rate_name','') != '':
-                    rate = Rate(util=electric_tariff.get('urdb_utility_name'), rate=electric_tariff.get('urdb_rate_name'))
+                    urdb_dict = Rate(util=electric_tariff.get('urdb_utility_name'), rate=electric_tariff.get('urdb_rate_name')).urdb_dict
 
-                    if rate.urdb_dict is None:
+                    if urdb_dict is None:
                         self.urdb_errors.append(
                             "Unable to download {} from URDB. Please check the input values for 'urdb_utility_name' and 'urdb_rate_name'."
                                 .format(electric_tariff.get('urdb_rate_name'))
                         )
                     else:
-                        electric_tariff['urdb_response'] = rate.urdb_dict
+                        electric_tariff['urdb_response'] = urdb_dict
                         self.validate_urdb_response()
 
                 if electric_tariff['add_blended_rates_to_urdb_rate']:
@@ -770,10 +1062,10 @@ class ValidateNestedInput:
 
                         self.input_data_errors.append('add_blended_rates_to_urdb_rate is set to \'true\' yet missing valid entries for the following inputs: {}'.format(', '.join(missing_keys)))
 
-                for blended in ['blended_monthly_demand_charges_us_dollars_per_kw','blended_monthly_rates_us_dollars_per_kwh']:
-                    if electric_tariff.get(blended, False):
-                        if len(electric_tariff.get(blended)) != 12:
-                            self.input_data_errors.append('{} array needs to contain 12 valid numbers.'.format(blended) )
+                for blended in _BLENDED_KEYS:
+                    blended_values = electric_tariff.get(blended)
+                    if blended_values and len(blended_values) != 12:
+                        self.input_data_errors.append('{} array needs to contain 12 valid numbers.'.format(blended) )
             
             if object_name_path[-1] == "LoadProfile":
                 for lp in ['critical_loads_kw', 'loads_kw']:
@@ -785,7 +1077,7 @@ class ValidateNestedInput:
                         if not isnet:
                             # next line can fail if non-numeric values are passed in for (critical_)loads_kw
                             if self.isValid:
-                                if min(real_values.get(lp)) < 0:
+                                if np.min(real_values[lp]) < 0:
                                     self.input_data_errors.append("{} must contain loads greater than or equal to zero.".format(lp))
 
 
@@ -793,7 +1085,7 @@ class ValidateNestedInput:
                     real_values['year'] = 2017
 
 
-        def check_min_max_restrictions(self, object_name_path, template_values=None, real_values=None):
+        def check_min_max_restrictions(self, object_name_path, template_values=None, real_values=None, object_name_str=None):
             """
             comparison_function for recursively_check_input_dict.
             check all min/max constraints for input values defined in nested_input_definitions.
@@ -805,53 +1097,17 @@ class ValidateNestedInput:
             :param real_values: dict, the attributes corresponding to the object at object_name_path within the
                 input_dict to check and/or modify. For example, with a object_name_path of ["Scenario", "Site", "PV"]
                  the real_values would look like: {'latitude': 39.345678, 'longitude': -90.3, ... }
+            :param object_name_str: str, object_name_path joined with '>', eg. "Scenario>Site>PV"
             :return: None
             """
+            if object_name_str is None:  # called outside of recursively_check_input_dict
+                object_name_str = self.object_name_string(object_name_path)
+            # only attributes with a min, max, or restrict_to are checked (type conversion errors are caught in
+            # convert_data_types), by the function generated for this object in _compile_min_max_check
             if real_values is not None:
-                for name, value in real_values.items():
-                    if self.isAttribute(name):
-                        data_validators = template_values[name]
-
-                        if "list_of_float" in data_validators['type'] and isinstance(value, list):
-                            if data_validators.get('min') is not None:
-                                if any([v < data_validators['min'] for v in value]):
-                                    self.input_data_errors.append(
-                                        'At least one value in %s (from %s) exceeds allowable min of %s' % (
-                                         name, self.object_name_string(object_name_path), data_validators['min']))
-
-                            if data_validators.get('max') is not None:
-                                if any([v < data_validators['max'] for v in value]):
-                                    self.input_data_errors.append(
-                                        'At least one value in %s (from %s) exceeds the allowable max of %s' % (
-                                         name, self.object_name_string(object_name_path), data_validators['max']))
-                            continue
-                        elif isinstance(data_validators['type'], list):
-                            data_type = float
-                        else:
-                            data_type = eval(data_validators['type'])
+                _get_schema_node(template_values).check_min_max(real_values, self.input_data_errors, object_name_str)
 
-                        try:  # to convert input value to restricted type
-                            value = data_type(value)
-                        except:
-                            self.input_data_errors.append('Could not check min/max on %s (%s) in %s' % (
-                            name, value, self.object_name_string(object_name_path)))
-                        else:
-                            if data_validators.get('min') is not None:
-                                if value < data_validators['min']:
-                                    self.input_data_errors.append('%s value (%s) in %s exceeds allowable min %s' % (
-                                    name, value, self.object_name_string(object_name_path), data_validators['min']))
-
-                            if data_validators.get('max') is not None:
-                                if value > data_validators['max']:
-                                    self.input_data_errors.append('%s value (%s) in %s exceeds allowable max %s' % (
-                                    name, value, self.object_name_string(object_name_path), data_validators['max']))
-
-                        if data_validators.get('restrict_to') is not None:
-                            if value not in data_validators['restrict_to']:
-                                self.input_data_errors.append('%s value (%s) in %s not in allowable inputs - %s' % (
-                                name, value, self.object_name_string(object_name_path), data_validators['restrict_to']))
-
-        def convert_data_types(self, object_name_path, template_values=None, real_values=None):
+        def convert_data_types(self, object_name_path, template_values=None, real_values=None, object_name_str=None):
             """
             comparison_function for recursively_check_input_dict.
             try to convert input values to the expected python data type, create error message if conversion fails.
@@ -862,59 +1118,69 @@ class ValidateNestedInput:
             :param real_values: dict, the attributes corresponding to the object at object_name_path within the
                 input_dict to check and/or modify. For example, with a object_name_path of ["Scenario", "Site", "PV"]
                  the real_values would look like: {'latitude': 39.345678, 'longitude': -90.3, ... }
+            :param object_name_str: str, object_name_path joined with '>', eg. "Scenario>Site>PV"
             :return: None
             """
+            if object_name_str is None:  # called outside of recursively_check_input_dict
+                object_name_str = self.object_name_string(object_name_path)
             if real_values is not None:
-                for name, value in real_values.items():
-                    if self.isAttribute(name):
+                for name, definition in _get_schema_node(template_values).attributes:
+                    value = real_values.get(name)
+                    if value is not None:
                         make_array = False
-                        attribute_type = template_values[name]['type']  # attribute_type's include list_of_float
+                        attribute_type = definition.type  # attribute_type's include list_of_float
                         if isinstance(attribute_type, list) and \
                                 all([x in attribute_type for x in ['float', 'list_of_float']]):
                             if isinstance(value, list):
                                 try:
-                                    series = pd.Series(value)
-                                    if series.isnull().values.any():
+                                    # one C-level conversion and scan instead of a pandas Series and a list of floats
+                                    array = np.asarray(value, dtype=np.float64)
+                                    if array.ndim != 1:
+                                        raise ValueError
+                                    if np.isnan(array).any():  # None values are converted to NaN too
                                         raise NotImplementedError
-                                    new_value = list_of_float(value)
+                                    new_value = array.tolist()
                                 except ValueError:
                                     self.input_data_errors.append(
                                         'Could not convert %s (%s) in %s to list of floats' % (name, value,
-                                                         self.object_name_string(object_name_path))
+                                                         object_name_str)
                                     )
                                     continue  # both continue statements should be in a finally clause, ...
                                 except NotImplementedError:
                                     self.input_data_errors.append(
                                         '%s in %s contains at least one NaN value.' % (name,
-                                        self.object_name_string(object_name_path))
+                                        object_name_str)
                                     )
                                     continue  # both continue statements should be in a finally clause, ...
                                 else:
-                                    self.update_attribute_value(object_name_path, name, new_value)
+                                    real_values[name] = new_value
                                     self.validate_8760(attr=new_value, obj_name=object_name_path[-1], attr_name=name,
                                                        time_steps_per_hour=self.input_dict['Scenario']['time_steps_per_hour'])
                                     continue  # ... but python 2.7  does not support continue in finally clauses
                             else:
                                 attribute_type = 'float'
                                 make_array = True
-                        attribute_type = eval(attribute_type)  # convert string to python type
+                        attribute_type = _TYPE_MAP[attribute_type]  # convert string to python type
                         try:  # to convert input value to type defined in nested_input_definitions
-                            new_value = attribute_type(value)
+                            if attribute_type is list_of_float:
+                                new_value = _convert_list_of_float(value)
+                            else:
+                                new_value = attribute_type(value)
                         except:  # if fails for any reason record that the conversion failed
                             self.input_data_errors.append('Could not convert %s (%s) in %s to %s' % (name, value,
-                                     self.object_name_string(object_name_path), str(attribute_type).split(' ')[1]))
+                                     object_name_str, str(attribute_type).split(' ')[1]))
                         else:
                             if not isinstance(new_value, bool):
                                 if make_array:
                                     new_value = [new_value]
-                                self.update_attribute_value(object_name_path, name, new_value)
+                                real_values[name] = new_value
                             else:
                                 if value not in [True, False, 1, 0]:
                                     self.input_data_errors.append('Could not convert %s (%s) in %s to %s' % (
-                                    name, value, self.object_name_string(object_name_path),
+                                    name, value, object_name_str,
                                     str(attribute_type).split(' ')[1]))
 
-        def fillin_defaults(self, object_name_path, template_values=None, real_values=None):
+        def fillin_defaults(self, object_name_path, template_values=None, real_values=None, object_name_str=None):
             """
             comparison_function for recursively_check_input_dict.
             fills in default values for inputs that user does not provide.
@@ -925,34 +1191,33 @@ class ValidateNestedInput:
             :param real_values: dict, the attributes corresponding to the object at object_name_path within the
                 input_dict to check and/or modify. For example, with a object_name_path of ["Scenario", "Site", "PV"]
                  the real_values would look like: {'latitude': 39.345678, 'longitude': -90.3, ... }
+            :param object_name_str: str, object_name_path joined with '>', eg. "Scenario>Site>PV"
             :return: None
             """
             if real_values is None:
                 real_values = {}
                 self.update_attribute_value(object_name_path[:-1], object_name_path[-1], real_values)
 
-            for template_key, template_value in template_values.items():
-                if self.isAttribute(template_key):
-                    default = template_value.get('default')
-                    if default is not None and real_values.get(template_key) is None:
+            for template_key, default, wrap_default_in_list, is_object in _get_schema_node(template_values).defaults:
+                if not is_object:
+                    if real_values.get(template_key) is None:
                         if isinstance(default, str):  # special case for PV.tilt.default = "Site latitude"
                             if " " in default:
                                 d = self.input_dict['Scenario']
                                 for key in default.split(' '):
                                     d = d.get(key)
                                 default = d
-                        if isinstance(template_value.get('type'), list) and "list_of_float" in template_value.get('type'):
+                        if wrap_default_in_list:
                             # then input can be float or list_of_float, but for database we have to use only one type
                             default = [default]
-                        self.update_attribute_value(object_name_path, template_key, default)
+                        real_values[template_key] = default
                         self.defaults_inserted.append([template_key, object_name_path])
 
-                if self.isSingularKey(template_key):
-                    if template_key not in real_values.keys():
-                        self.update_attribute_value(object_name_path, template_key, {})
-                        self.defaults_inserted.append([template_key, object_name_path])
+                elif template_key not in real_values.keys():
+                    real_values[template_key] = {}
+                    self.defaults_inserted.append([template_key, object_name_path])
 
-        def check_required_attributes(self, object_name_path, template_values=None, real_values=None):
+        def check_required_attributes(self, object_name_path, template_values=None, real_values=None, object_name_str=None):
             """
             comparison_function for recursively_check_input_dict.
             confirm that required inputs were provided by user. If not, create message to provide to user.
@@ -963,63 +1228,65 @@ class ValidateNestedInput:
             :param real_values: dict, the attributes corresponding to the object at object_name_path within the
                 input_dict to check and/or modify. For example, with a object_name_path of ["Scenario", "Site", "PV"]
                  the real_values would look like: {'latitude': 39.345678, 'longitude': -90.3, ... }
+            :param object_name_str: str, object_name_path joined with '>', eg. "Scenario>Site>PV"
             :return: None
             """
+            if object_name_str is None:  # called outside of recursively_check_input_dict
+                object_name_str = self.object_name_string(object_name_path)
+            schema_node = _get_schema_node(template_values)
+            if all(real_values.get(k) is not None for k in schema_node.required_keys):
+                return  # nothing is required of this object, or everything that could be required has a value
+
             final_message = ''
+            real_keys = set(real_values)
 
             # conditional check for complex cases where replacements are available for attributes and there are dependent attributes (annual_kwh and doe_reference_building_name)
             all_missing_attribute_sets = []
 
-            for key,value in template_values.items():
-
-                if self.isAttribute(key):
+            for key, replacements, depends_on in schema_node.dependent_attributes:
 
-                    missing_attribute_sets = []
-                    replacements = value.get('replacement_sets')
-                    depends_on = value.get('depends_on') or []
+                missing_attribute_sets = []
 
-                    if replacements is not None:
-                        current_set = [key] + depends_on
+                if replacements is not None:
+                    current_set = [key] + depends_on
 
-                        if list(set(current_set)-set(real_values.keys())) != []:
-                            for replace in replacements:
-                                missing = list(set(replace)-set(real_values.keys()))
+                    if any(k not in real_keys for k in current_set):
+                        for replace in replacements:
+                            missing = [r for r in replace if r not in real_keys]
 
-                                if missing == []:
-                                    missing_attribute_sets = []
-                                    break
+                            if missing == []:
+                                missing_attribute_sets = []
+                                break
 
-                                else:
-                                    replace = sorted(replace)
-                                    if replace not in missing_attribute_sets:
-                                        missing_attribute_sets.append(replace)
+                            else:
+                                replace = sorted(replace)
+                                if replace not in missing_attribute_sets:
+                                    missing_attribute_sets.append(replace)
 
-                    else:
-                        if real_values.get(key) is not None:
-                            missing = []
-                            for dependent_key in depends_on:
-                                if real_values.get(dependent_key) is None:
-                                    missing.append(dependent_key)
+                else:
+                    if real_values.get(key) is not None:
+                        missing = []
+                        for dependent_key in depends_on:
+                            if real_values.get(dependent_key) is None:
+                                missing.append(dependent_key)
 
-                            if missing !=[]:
-                                missing_attribute_sets.append(missing)
+                        if missing !=[]:
+                            missing_attribute_sets.append(missing)
 
-                    if len(missing_attribute_sets) > 0:
-                        missing_attribute_sets = sorted(missing_attribute_sets)
-                        message =  '(' + ' OR '.join([' and '.join(missing_set) for missing_set in missing_attribute_sets]) + ')'
-                        if message not in all_missing_attribute_sets:
-                            all_missing_attribute_sets.append(message)
+                if len(missing_attribute_sets) > 0:
+                    missing_attribute_sets = sorted(missing_attribute_sets)
+                    message =  '(' + ' OR '.join([' and '.join(missing_set) for missing_set in missing_attribute_sets]) + ')'
+                    if message not in all_missing_attribute_sets:
+                        all_missing_attribute_sets.append(message)
 
             if len(all_missing_attribute_sets) > 0:
                 final_message = " AND ".join(all_missing_attribute_sets)
 
             # check simple required attributes
             missing = []
-            for template_key, template_value in template_values.items():
-                if self.isAttribute(template_key):
-                    if template_value.get('required') == True:
-                        if real_values.get(template_key) is None:
-                            missing.append(template_key)
+            for template_key in schema_node.required_attributes:
+                if real_values.get(template_key) is None:
+                    missing.append(template_key)
 
             if len(missing) > 0:
                 message = ' and '.join(missing)
@@ -1029,7 +1296,7 @@ class ValidateNestedInput:
                     final_message = message
 
             if final_message != '':
-                self.input_data_errors.append('Missing Required for %s: %s' % (self.object_name_string(object_name_path), final_message))
+                self.input_data_errors.append('Missing Required for %s: %s' % (object_name_str, final_message))
 
 
         def validate_urdb_response(self):
@@ -1049,6 +1316,19 @@ class ValidateNestedInput:
                 except:
                    self.urdb_errors.append('Error parsing urdb rate in %s ' % (["Scenario", "Site", "ElectricTariff"]))
 
+        def time_series_array(self, attr, attr_name):
+            """
+            Convert a time-series to an array of floats for resampling, or add an input error if it is not numeric
+            :param attr: list of floats
+            :param attr_name: str, name of time-series (eg. "critical_loads_kw")
+            :return: numpy.ndarray of float64, or None if attr could not be converted
+            """
+            try:
+                return np.asarray(attr, dtype=np.float64)
+            except (TypeError, ValueError):  # eg. a series that could not be converted in convert_data_types
+                self.input_data_errors.append("{} must be numeric.".format(attr_name))
+                return None
+
         def validate_8760(self, attr, obj_name, attr_name, time_steps_per_hour):
             """
             This method is for the case that a user uploads a time-series that has either 30 minute or 15 minute
@@ -1061,61 +1341,103 @@ class ValidateNestedInput:
             :param time_steps_per_hour: int, [1, 2, 4]
             :return: None
             """
+            if len(self.input_data_errors) >= _MAX_INPUT_ERRORS:
+                return
+            if time_steps_per_hour not in (1, 2, 4):
+                return  # an invalid time_steps_per_hour is reported by convert_data_types/check_min_max_restrictions
+            resampled_append = self.resampled_inputs.append
             n = len(attr)
-            length_list = [8760, 17520, 35040]
-
+            if n == 8760 * time_steps_per_hour:
+                return  # already at the resolution of the model
+
+            if n not in _TIME_SERIES_LENGTHS:
+                self.input_data_errors.append(_INVALID_LENGTH_MESSAGE % attr_name)
+                return
+            if time_steps_per_hour != 1 and \
+                    attr_name not in ["wholesale_rate_us_dollars_per_kwh", "wholesale_rate_above_site_load_us_dollars_per_kwh"]:
+                return  # the resolution of other time-series is handled within each time-series' implementation
+
+            path = ("Scenario", "Site", obj_name)  # of the object to update with a resampled series
+            array = self.time_series_array(attr, attr_name)
+            if array is None:
+                return
+
+            if time_steps_per_hour != 1:  # wholesale rates
+                if time_steps_per_hour == 2 and n/8760 == 4:
+                    resampled_append([_15_TO_30_MINUTE_MESSAGE % attr_name, [obj_name]])
+                    resampled_val = _downsample_mean(array, 2).tolist()
+                elif time_steps_per_hour == 4 and n/8760 == 2:
+                    resampled_append([_30_TO_15_MINUTE_MESSAGE % attr_name, [obj_name]])
+                    resampled_val = np.repeat(array, 2).tolist()
+                elif time_steps_per_hour == 4 and n/8760 == 1:
+                    resampled_append([_HOURLY_TO_15_MINUTE_MESSAGE % attr_name, [obj_name]])
+                    resampled_val = np.repeat(array, 4).tolist()
+                else:  # time_steps_per_hour == 2 and n/8760 == 1:
+                    resampled_append([_HOURLY_TO_30_MINUTE_MESSAGE % attr_name, [obj_name]])
+                    resampled_val = np.repeat(array, 2).tolist()
+                self.update_attribute_value(path, attr_name, resampled_val)
+
+            else:  # n in [17520, 35040]
+                factor = n // 8760  # samples per hour
+                resolution_minutes = 60 // factor
+                resampled_append([_HOURLY_DOWNSAMPLE_MESSAGE % (attr_name, resolution_minutes), [obj_name]])
+                resampled_val = _downsample_mean(array, factor).tolist()
+                self.update_attribute_value(path, attr_name, resampled_val)
+
+        def validate_8760_batch(self, obj_name, attrs, time_steps_per_hour):
+            """
+            validate_8760 for several time-series of one object. For an hourly model (time_steps_per_hour = 1) the series
+            with the same sub-hourly resolution are stacked and downsampled together.
+            :param obj_name: str, parent object name from nested_inputs (eg. "Wind")
+            :param attrs: list of (attr_name, attr), attr being a list of floats
+            :param time_steps_per_hour: int, [1, 2, 4]
+            :return: None
+            """
+            if len(self.input_data_errors) >= _MAX_INPUT_ERRORS:
+                return
+            if time_steps_per_hour not in (1, 2, 4):
+                return  # an invalid time_steps_per_hour is reported by convert_data_types/check_min_max_restrictions
             if time_steps_per_hour != 1:
-                if n not in length_list:
-                    self.input_data_errors.append(
-                        "Invalid length for {}. Samples must be hourly (8,760 samples), 30 minute (17,520 samples), or 15 minute (35,040 samples)".format(attr_name)
-                    )
-                elif attr_name in ["wholesale_rate_us_dollars_per_kwh", "wholesale_rate_above_site_load_us_dollars_per_kwh"]:
-                    if time_steps_per_hour != n/8760:
-                        if time_steps_per_hour == 2 and n/8760 == 4:
-                            self.resampled_inputs.append(
-                                ["Downsampled {} from 15 minute resolution to 30 minute resolution to match time_steps_per_hour via average.".format(attr_name), [obj_name]])
-                            index = pd.date_range('1/1/2000', periods=n, freq='15T')
-                            series = pd.Series(attr, index=index)
-                            series = series.resample('30T').mean()
-                            resampled_val = series.tolist()
-                        elif time_steps_per_hour == 4 and n/8760 == 2:
-                            self.resampled_inputs.append(
-                                ["Upsampled {} from 30 minute resolution to 15 minute resolution to match time_steps_per_hour via forward-fill.".format(attr_name), [obj_name]])
-                            resampled_val = [x for x in attr for _ in [1, 2]]
-                        elif time_steps_per_hour == 4 and n/8760 == 1:
-                            self.resampled_inputs.append(
-                                ["Upsampled {} from hourly resolution to 15 minute resolution to match time_steps_per_hour via forward-fill.".format(attr_name), [obj_name]])
-                            resampled_val = [x for x in attr for _ in [1, 2, 3, 4]]
-                        else:  # time_steps_per_hour == 2 and n/8760 == 1:
-                            self.resampled_inputs.append(
-                                ["Upsampled {} from hourly resolution to 30 minute resolution to match time_steps_per_hour via forward-fill.".format(attr_name), [obj_name]])
-                            resampled_val = [x for x in attr for _ in [1, 2]]
-                        self.update_attribute_value(["Scenario", "Site", obj_name], attr_name, resampled_val)
-
-            elif n == 8760:
-                pass  # because n/8760 == time_steps_per_hour ( = 1 )
-
-            elif n in [17520, 35040]:
-                resolution_minutes = int(60/(n/8760))
-                self.resampled_inputs.append(
-                    ["Downsampled {} from {} minute resolution to hourly resolution to match time_steps_per_hour via average.".format(
-                            attr_name, resolution_minutes), [obj_name]])
-                index = pd.date_range('1/1/2000', periods=n, freq='{}T'.format(resolution_minutes))
-                series = pd.Series(attr, index=index)
-                series = series.resample('1H').mean()
-                self.update_attribute_value(["Scenario", "Site", obj_name], attr_name, series.tolist())
-            else:
-                self.input_data_errors.append("Invalid length for {}. Samples must be hourly (8,760 samples), 30 minute (17,520 samples), or 15 minute (35,040 samples)".format(attr_name))
-
-        def validate_text_fields(self, pattern=r'^[-0-9a-zA-Z  $:;)(*&#!@]*$', str="", err_msg=""):
-            match = re.search(pattern, str)
-            if match:
-                pass
-            else:
+                for attr_name, attr in attrs:
+                    self.validate_8760(attr, obj_name, attr_name, time_steps_per_hour)
+                return
+
+            batches = dict()  # {number of samples: [(attr_name, array), ...]}
+            for attr_name, attr in attrs:
+                n = len(attr)
+                if n != 8760 and n in _TIME_SERIES_LENGTHS:
+                    array = self.time_series_array(attr, attr_name)
+                    if array is None:
+                        continue
+                    self.resampled_inputs.append(
+                        [_HOURLY_DOWNSAMPLE_MESSAGE % (attr_name, 60 // (n // 8760)), [obj_name]])
+                    batches.setdefault(n, []).append((attr_name, array))
+                else:
+                    self.validate_8760(attr, obj_name, attr_name, time_steps_per_hour)
+
+            path = ("Scenario", "Site", obj_name)
+            for n, batch in batches.items():
+                hourly = _downsample_mean(np.stack([array for attr_name, array in batch]), n // 8760)
+                for (attr_name, array), resampled_val in zip(batch, hourly):
+                    self.update_attribute_value(path, attr_name, resampled_val.tolist())
+
+        def validate_text_fields(self, strip=_TEXT_FIELD_STRIP, value="", err_msg=""):
+            # strip is a str.translate table that deletes the allowed characters (the default allows those of
+            # r'^[-0-9a-zA-Z  $:;)(*&#!@]*$'), so any character left is not allowed
+            if value.translate(strip):
                 self.input_data_errors.append(err_msg)
 
         def validate_user_uuid(self, user_uuid="", err_msg=""):
+            # reject any character that cannot be part of a UUID string before parsing
+            if not isinstance(user_uuid, str) or not _UUID_CHARS.issuperset(user_uuid):
+                self.input_data_errors.append(err_msg)
+                return
+            # parse like uuid.UUID, but require exactly 32 hex digits: uuid.UUID also accepts whatever int(..., 16)
+            # does, eg. 30 hex digits with a 0x prefix or 31 with a + prefix, which are rejected here
+            hex_digits = user_uuid.replace('urn:', '').replace('uuid:', '').strip('{}').replace('-', '')
             try:
-                uuid.UUID(user_uuid)  # raises ValueError if not valid uuid
-            except:
+                if len(hex_digits) != 32:
+                    raise ValueError
+                bytes.fromhex(hex_digits)  # raises ValueError if not all hex digits
+            except ValueError:
                 self.input_data_errors.append(err_msg)
@@ -49,7 +49,8 @@ from django.template import  loader
 
 # loading the labels of hard problems - doing it here so loading happens once on startup
 hard_problems_csv = os.path.join('reo', 'hard_problems.csv')
-hard_problem_labels = [i[0] for i in csv.reader(open(hard_problems_csv, 'r'))]
+with open(hard_problems_csv, 'r', newline='') as f:
+    hard_problem_labels = frozenset(i[0] for i in csv.reader(f) if i)
 
 
 def make_error_resp(msg):
@@ -82,7 +83,7 @@ def invalid_urdb(request):
     try:
         # invalid set is populated by the urdb validator, hard problems defined in csv
         invalid_set = list(set([i.label for i in URDBError.objects.filter(type='Error')]))
-        return JsonResponse({"Invalid IDs": list(set(invalid_set + hard_problem_labels))})
+        return JsonResponse({"Invalid IDs": list(set(invalid_set) | hard_problem_labels)})
         
     except Exception as e:
         return JsonResponse({"Error": "Unexpected error in invalid_urdb endpoint: {}".format(e.args[0])})